@@ -15,6 +15,25 @@ class AbstractMonitor(ABC):
     Abstract base class for state variable monitors.
     """
 
+    def preallocate(self, time: int) -> None:
+        # language=rst
+        """
+        Announces that the next ``time`` recordings will be made with ``record_at``.
+        Monitors that do not pre-allocate storage ignore this.
+
+        :param time: Number of timesteps of the upcoming simulation.
+        """
+
+    def record_at(self, t: int) -> None:
+        # language=rst
+        """
+        Records the current value of the state variables at timestep ``t`` of a
+        simulation announced with ``preallocate``. Defaults to ``record``.
+
+        :param t: Timestep of the current simulation.
+        """
+        self.record()
+
 
 class Monitor(AbstractMonitor):
     # language=rst
@@ -48,6 +67,18 @@ class Monitor(AbstractMonitor):
         # Deal with time later, the same underlying list is used
         self.recording = {v: [] for v in self.state_vars}
 
+        # Per-simulation ``[time, ...]`` buffers filled in by ``record_at``, their
+        # position in the recording, and the number of timesteps written to them.
+        self._steps = None
+        self._buffers = None
+        self._index = None
+        self._written = 0
+
+        # If ``time`` is given, ``[time, ...]`` ring buffers holding the last ``time``
+        # recordings, and the number of recordings made so far.
+        self._ring = None
+        self._count = 0
+
     def get(self, var: str) -> torch.Tensor:
         # language=rst
         """
@@ -57,22 +88,98 @@ class Monitor(AbstractMonitor):
         :return: Tensor of shape ``[time, n_1, ..., n_k]``, where ``[n_1, ..., n_k]`` is
             the shape of the recorded state variable.
         """
-        return torch.cat(self.recording[var], 0)
+        if self.time is None or self._ring is None:
+            recording = self.recording[var]
+            if self._buffers is not None and self._written < self._steps:
+                # The simulation stopped early (or is still running); leave out the
+                # timesteps that were never written.
+                i = self._index
+                recording = (
+                    recording[:i] + [recording[i][: self._written]] + recording[i + 1 :]
+                )
+
+            return torch.cat(recording, 0)
+
+        # Oldest recording first.
+        ring = self._ring[var]
+        if self._count <= self.time:
+            return ring[: self._count].clone()
+
+        return ring.roll(-(self._count % self.time), 0)
 
     def record(self) -> None:
         # language=rst
         """
         Appends the current value of the recorded state variables to the recording.
         """
+        if self.time is None:
+            for v in self.state_vars:
+                data = getattr(self.obj, v).unsqueeze(0)
+                self.recording[v].append(data.detach().clone())
+
+            return
+
+        # overwrite the oldest element of the ring buffer
+        if self._ring is None:
+            self._ring = {}
+            for v in self.state_vars:
+                data = getattr(self.obj, v)
+                self._ring[v] = torch.empty(
+                    self.time, *data.shape, dtype=data.dtype, device=data.device
+                )
+
+        t = self._count % self.time
         for v in self.state_vars:
-            data = getattr(self.obj, v).unsqueeze(0)
-            self.recording[v].append(data.detach().clone())
+            self._ring[v][t].copy_(getattr(self.obj, v).detach())
 
-        # remove the oldest element (first in the list)
-        if self.time is not None:
+        self._count += 1
+
+    def preallocate(self, time: int) -> None:
+        # language=rst
+        """
+        Announces a simulation of ``time`` timesteps. A single ``[time, ...]`` buffer
+        per state variable is allocated on the first call to ``record_at`` and
+        appended to the recording, so that every timestep is written in place.
+
+        :param time: Number of timesteps of the upcoming simulation.
+        """
+        # Drop the unwritten timesteps of a previous simulation that stopped early.
+        if self._buffers is not None and self._written < self._steps:
+            for v in self.state_vars:
+                self.recording[v][self._index] = self._buffers[v][: self._written]
+
+        self._steps = time
+        self._buffers = None
+        self._written = 0
+
+    def record_at(self, t: int) -> None:
+        # language=rst
+        """
+        Writes the current value of the recorded state variables to timestep ``t`` of
+        the buffers announced with ``preallocate``.
+
+        :param t: Timestep of the current simulation.
+        """
+        # Bounded recordings keep only the last ``time`` entries.
+        if self.time is not None or getattr(self, "_steps", None) is None:
+            self.record()
+            return
+
+        if self._buffers is None:
+            self._buffers = {}
+            self._index = len(next(iter(self.recording.values()), []))
             for v in self.state_vars:
-                if len(self.recording[v]) > self.time:
-                    self.recording[v].pop(0)
+                data = getattr(self.obj, v)
+                buffer = torch.empty(
+                    self._steps, *data.shape, dtype=data.dtype, device=data.device
+                )
+                self.recording[v].append(buffer)
+                self._buffers[v] = buffer
+
+        for v in self.state_vars:
+            self._buffers[v][t].copy_(getattr(self.obj, v).detach())
+
+        self._written = t + 1
 
     def reset_state_variables(self) -> None:
         # language=rst
@@ -80,6 +187,10 @@ class Monitor(AbstractMonitor):
         Resets recordings to empty ``torch.Tensor``s.
         """
         self.recording = {v: [] for v in self.state_vars}
+        self._buffers = None
+        self._written = 0
+        self._ring = None
+        self._count = 0
 
 
 class NetworkMonitor(AbstractMonitor):
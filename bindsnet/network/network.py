@@ -1,20 +1,32 @@
-import tempfile
-from typing import Dict, Optional, Type, Iterable
+import copy
+import inspect
+import weakref
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Type, Iterable, Union
 
 import torch
 import threading
-from multiprocessing.pool import ThreadPool
 import queue
 
 from .monitors import AbstractMonitor
 from .nodes import Nodes
-from .topology import AbstractConnection
+from .topology import AbstractConnection, Connection
 from ..learning.reward import AbstractReward
 
 import os
 import time as timeModule
 
-def load(file_name: str, map_location: str = "cpu", learning: bool = None) -> "Network":
+# Keyword arguments of ``torch.load`` not supported by all PyTorch versions.
+_LOAD_PARAMETERS = inspect.signature(torch.load).parameters
+
+
+def load(
+    file_name: Union[str, Path],
+    map_location: str = "cpu",
+    learning: bool = None,
+    mmap: bool = False,
+) -> "Network":
     # language=rst
     """
     Loads serialized network object from disk.
@@ -23,14 +35,188 @@ def load(file_name: str, map_location: str = "cpu", learning: bool = None) -> "N
     :param map_location: One of ``"cpu"`` or ``"cuda"``. Defaults to ``"cpu"``.
     :param learning: Whether to load with learning enabled. Default loads value from
         disk.
+    :param mmap: Whether to memory-map the file instead of reading the tensors into
+        memory (if supported by PyTorch). The tensors then stay backed by the file,
+        so it must not be overwritten (e.g., by saving the network to the same path)
+        while the network is in use.
     """
-    network = torch.load(open(file_name, "rb"), map_location=map_location)
+    # Whole ``Network`` objects are pickled, not just weights.
+    kwargs = {}
+    if "weights_only" in _LOAD_PARAMETERS:
+        kwargs["weights_only"] = False
+    if mmap and "mmap" in _LOAD_PARAMETERS:
+        kwargs["mmap"] = True
+
+    network = torch.load(str(file_name), map_location=map_location, **kwargs)
     if learning is not None and "learning" in vars(network):
         network.learning = learning
 
     return network
 
 
+@torch.jit.script
+def _apply_clamps(
+    s: torch.Tensor,
+    v: Optional[torch.Tensor],
+    overrides: List[Tuple[torch.Tensor, torch.Tensor]],
+    inject_v: Optional[torch.Tensor],
+) -> None:
+    # language=rst
+    """
+    Clamps neurons to spiking or not spiking and injects voltage, in place. Compiled
+    with TorchScript so that the whole sequence is a single call per layer and
+    timestep.
+
+    :param s: Spikes of the layer.
+    :param v: Voltages of the layer, if it has any.
+    :param overrides: ``(neurons, value)`` pairs, applied in order, setting the spikes
+        of the neurons (a mask or indices) to the value at this timestep.
+    :param inject_v: Voltage to inject at this timestep.
+    """
+    # Clamp neurons to spike or not to spike.
+    for neurons, value in overrides:
+        s[:, neurons] = value.to(s.dtype)
+
+    # Inject voltage to neurons.
+    if inject_v is not None:
+        if v is not None:
+            v.add_(inject_v)
+
+
+def _sum_into(buffer: torch.Tensor, posts: List[torch.Tensor]) -> None:
+    # language=rst
+    """
+    Writes the sum of a layer's incoming contributions into its input buffer. Some
+    connections (e.g., ``MeanFieldConnection``) return outputs that only broadcast to
+    the buffer's shape; those are accumulated one by one instead of in a single
+    reduction.
+
+    :param buffer: Input buffer of shape ``[batch_size, *target.shape]``.
+    :param posts: Outputs of the connections into the layer.
+    """
+    if len(posts) > 1 and all(post.shape == buffer.shape for post in posts):
+        torch.sum(torch.stack(posts), 0, out=buffer)
+    else:
+        buffer.copy_(posts[0])
+        for post in posts[1:]:
+            buffer.add_(post)
+
+
+def _per_timestep(x: Optional[torch.Tensor], timesteps: int) -> list:
+    # language=rst
+    """
+    Splits a clamp mask or injected voltage into one tensor per timestep.
+
+    :param x: ``None``, or a tensor of shape ``[n_neurons]`` (same every timestep) or
+        ``[time, n_neurons]``.
+    :param timesteps: Number of simulation timesteps.
+    :return: List of per-timestep tensors (or ``None``s).
+    """
+    if x is None or x.dim() == 1:
+        return [x] * timesteps
+
+    return list(x.unbind(0))
+
+
+def _mask_per_timestep(mask: Optional[torch.Tensor], timesteps: int) -> list:
+    # language=rst
+    """
+    Like ``_per_timestep``, but converts boolean masks into neuron indices up front,
+    so that clamping in the simulation loop doesn't have to find the set neurons of a
+    mask on every timestep. A ``[time, n_neurons]`` mask is converted for all
+    timesteps at once.
+
+    :param mask: ``None``, or a boolean mask or index tensor of shape ``[n_neurons]``
+        (same every timestep) or ``[time, n_neurons]``.
+    :param timesteps: Number of simulation timesteps.
+    :return: List of per-timestep masks or indices (or ``None``s).
+    """
+    if mask is None or mask.dtype != torch.bool or mask.dim() > 2:
+        return _per_timestep(mask, timesteps)
+
+    if mask.dim() == 1:
+        return [mask.nonzero(as_tuple=True)[0]] * timesteps
+
+    _, neurons = mask.nonzero(as_tuple=True)
+    return list(neurons.split(mask.sum(1).tolist()))
+
+
+def _overrides_per_timestep(
+    clamp: Optional[torch.Tensor], unclamp: Optional[torch.Tensor], timesteps: int
+) -> list:
+    # language=rst
+    """
+    Combines clamp and unclamp masks into the spike overrides of each timestep.
+    Boolean masks are fused into a single write per timestep, setting each clamped or
+    unclamped neuron to its final value (unclamping wins over clamping); timesteps
+    without any are left empty. Other masks are written one after the other.
+
+    :param clamp: ``None``, or a mask of neurons clamped to spiking.
+    :param unclamp: ``None``, or a mask of neurons clamped to not spiking.
+    :param timesteps: Number of simulation timesteps.
+    :return: List of per-timestep lists of ``(neurons, value)`` overrides.
+    """
+    masks = [m for m in (clamp, unclamp) if m is not None]
+    if len(masks) == 2 and all(m.dtype == torch.bool and m.dim() <= 2 for m in masks):
+        clamp, unclamp = torch.broadcast_tensors(clamp, unclamp)
+        override = clamp | unclamp
+        value = clamp & ~unclamp
+
+        if override.dim() == 1:
+            neurons = override.nonzero(as_tuple=True)[0]
+            return [[(neurons, value[neurons])] if len(neurons) else []] * timesteps
+
+        steps, neurons = override.nonzero(as_tuple=True)
+        counts = override.sum(1).tolist()
+        return [
+            [(n, v)] if count else []
+            for n, v, count in zip(
+                neurons.split(counts), value[steps, neurons].split(counts), counts
+            )
+        ]
+
+    overrides = [[] for _ in range(timesteps)]
+    for mask, value in ((clamp, True), (unclamp, False)):
+        if mask is not None:
+            value = torch.tensor([value], device=mask.device)
+            for step, neurons in zip(overrides, _mask_per_timestep(mask, timesteps)):
+                step.append((neurons, value))
+
+    return overrides
+
+
+def _clamp_schedules(
+    clamps: Dict[str, torch.Tensor],
+    unclamps: Dict[str, torch.Tensor],
+    injects_v: Dict[str, torch.Tensor],
+    timesteps: int,
+) -> Dict[str, list]:
+    # language=rst
+    """
+    Resolves clamp, unclamp and voltage injection arguments once per simulation.
+
+    :param clamps: Mapping of layer names to masks of neurons clamped to spiking.
+    :param unclamps: Mapping of layer names to masks of neurons clamped to not
+        spiking.
+    :param injects_v: Mapping of layer names to voltages to inject.
+    :param timesteps: Number of simulation timesteps.
+    :return: Mapping of the names of affected layers to a list, indexed by timestep,
+        of ``(overrides, inject_v)`` arguments for ``_apply_clamps``.
+    """
+    schedules = {}
+    for l in set(clamps) | set(unclamps) | set(injects_v):
+        schedules[l] = list(
+            zip(
+                _overrides_per_timestep(
+                    clamps.get(l, None), unclamps.get(l, None), timesteps
+                ),
+                _per_timestep(injects_v.get(l, None), timesteps),
+            )
+        )
+
+    return schedules
+
+
 class Network(torch.nn.Module):
     # language=rst
     """
@@ -92,7 +278,8 @@ class Network(torch.nn.Module):
         batch_size: int = 1,
         learning: bool = True,
         reward_fn: Optional[Type[AbstractReward]] = None,
-        n_threads = 0
+        n_threads = 0,
+        sparse_spikes: bool = False,
     ) -> None:
         # language=rst
         """
@@ -103,11 +290,20 @@ class Network(torch.nn.Module):
         :param learning: Whether to allow connection updates. True by default.
         :param reward_fn: Optional class allowing for modification of reward in case of
             reward-modulated learning.
+        :param n_threads: Number of worker threads to simulate with. ``0`` simulates
+            on the calling thread.
+        :param sparse_spikes: Whether dense connections always compute their output
+            by gathering the weights of spiking neurons (``compute_sparse``) rather
+            than by matrix multiplication. Otherwise, ``Connection.compute`` chooses
+            between the two for binary spikes on the CPU (see
+            ``Connection.sparse_threshold``). On the GPU, gathering synchronizes with
+            the device on every call.
         """
         super().__init__()
 
         self.dt = dt
         self.batch_size = batch_size
+        self.sparse_spikes = sparse_spikes
 
         self.layers = {}
         self.connections = {}
@@ -120,12 +316,11 @@ class Network(torch.nn.Module):
         else:
             self.reward_fn = None
 
+        self._reset_plan()
+
+        # Worker pool for ``n_threads > 0``, started on first use.
         self.n_threads = n_threads
-        if n_threads > 0:
-            self.response_queue = queue.Queue()
-            #self.threadManager = ThreadManager(os.cpu_count())
-            self.threadPool = ThreadPool(n_threads)
-        
+        self.threadManager = None
 
     def add_layer(self, layer: Nodes, name: str) -> None:
         # language=rst
@@ -137,6 +332,7 @@ class Network(torch.nn.Module):
         """
         self.layers[name] = layer
         self.add_module(name, layer)
+        self._reset_plan()
 
         layer.train(self.learning)
         layer.compute_decays(self.dt)
@@ -155,6 +351,7 @@ class Network(torch.nn.Module):
         """
         self.connections[(source, target)] = connection
         self.add_module(source + "_to_" + target, connection)
+        self._reset_plan()
 
         connection.dt = self.dt
         connection.train(self.learning)
@@ -170,8 +367,9 @@ class Network(torch.nn.Module):
         self.monitors[name] = monitor
         monitor.network = self
         monitor.dt = self.dt
+        self._reset_plan()
 
-    def save(self, file_name: str) -> None:
+    def save(self, file_name: Union[str, Path]) -> None:
         # language=rst
         """
         Serializes the network object to disk.
@@ -204,7 +402,7 @@ class Network(torch.nn.Module):
             # Save the network to disk.
             network.save(str(Path.home()) + '/network.pt')
         """
-        torch.save(self, open(file_name, "wb"))
+        torch.save(self, str(file_name))
 
     def clone(self) -> "Network":
         # language=rst
@@ -213,10 +411,160 @@ class Network(torch.nn.Module):
 
         :return: A copy of this network.
         """
-        virtual_file = tempfile.SpooledTemporaryFile()
-        torch.save(self, virtual_file)
-        virtual_file.seek(0)
-        return torch.load(virtual_file)
+        return copy.deepcopy(self)
+
+    def _reset_plan(self) -> None:
+        # language=rst
+        """
+        Discards the cached execution plan. Called whenever layers, connections or
+        monitors are added to the network.
+        """
+        self._layer_plan = None
+        self._conn_plan = None
+        self._target_plan = None
+        self._monitor_plan = None
+        self._input_bufs = {}
+        self._zero_inputs = {}
+        self._streams = {}
+        self._conn_streams = {}
+        self._fast_inputs = None
+
+    def _compile_plan(self, merge_dense: bool = False) -> None:
+        # language=rst
+        """
+        Flattens the layer, connection and monitor dictionaries into lists so that the
+        simulation loop does not repeat dictionary lookups on every timestep.
+
+        :param merge_dense: Whether to compute all dense connections into the same
+            target with a single matrix multiplication. Only valid while their weights
+            don't change. Merging copies the weights of those connections, and
+            ``run`` rebuilds the plan (and so repeats the copy) on every call; with
+            many short simulations, the copy can cost more than it saves.
+        """
+        self._layer_plan = list(self.layers.items())
+        self._conn_plan = [
+            (c, connection, connection.source)
+            for c, connection in self.connections.items()
+        ]
+
+        # Group incoming connections by target layer, along with the method used to
+        # compute each connection's output.
+        incoming = {}
+        for c, connection, source in self._conn_plan:
+            if self.sparse_spikes and isinstance(connection, Connection):
+                compute = connection.compute_sparse
+            else:
+                compute = connection.compute
+
+            incoming.setdefault(c[1], []).append((connection, source, compute))
+
+        if merge_dense and not self.sparse_spikes:
+            for name, conns in incoming.items():
+                dense = [c for c, _, _ in conns if type(c) is Connection]
+                if len(dense) > 1:
+                    group = _DenseGroup(dense)
+                    conns[:] = [e for e in conns if type(e[0]) is not Connection]
+                    conns.append((dense[0], group, group.compute))
+
+        self._target_plan = [
+            (name, conns[0][0].target, conns)
+            for name, conns in incoming.items()
+        ]
+        self._monitor_plan = list(self.monitors.values())
+
+        # Batch size or device may have changed since the last simulation.
+        self._input_bufs = {}
+        self._zero_inputs = {}
+        self._fast_inputs = None
+
+    def __getstate__(self) -> dict:
+        # Cached plans are rebuilt on demand; don't serialize them.
+        state = self.__dict__.copy()
+        for key in (
+            "_layer_plan",
+            "_conn_plan",
+            "_target_plan",
+            "_monitor_plan",
+            "_input_bufs",
+            "_zero_inputs",
+            "_streams",
+            "_conn_streams",
+            "_fast_inputs",
+        ):
+            state.pop(key, None)
+
+        # Worker threads can't be serialized; they are restarted on demand.
+        state["threadManager"] = None
+
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self.__dict__.setdefault("threadManager", None)
+        self.__dict__.setdefault("sparse_spikes", False)
+        self._reset_plan()
+
+    def _thread_manager(self, n_threads: int) -> "ThreadManager":
+        # language=rst
+        """
+        Returns the network's persistent worker pool, (re)starting it if it does not
+        exist or has a different number of workers.
+
+        :param n_threads: Number of worker threads.
+        :return: The network's ``ThreadManager``.
+        """
+        if self.threadManager is None or self.threadManager.n_threads != n_threads:
+            self.threadManager = ThreadManager(n_threads)
+
+        return self.threadManager
+
+    def _layer_streams(self) -> Dict[str, "torch.cuda.Stream"]:
+        # language=rst
+        """
+        Returns a dedicated CUDA stream for every layer that lives on the GPU.
+
+        :return: Mapping of layer names to CUDA streams.
+        """
+        for l, layer in self.layers.items():
+            if l not in self._streams and layer.s.is_cuda:
+                self._streams[l] = torch.cuda.Stream(device=layer.s.device)
+
+        return self._streams
+
+    def _connection_streams(self) -> Dict[tuple, "torch.cuda.Stream"]:
+        # language=rst
+        """
+        Returns a dedicated CUDA stream for every connection into a layer on the GPU,
+        if there is more than one such connection.
+
+        :return: Mapping of connection names to CUDA streams.
+        """
+        cuda = [
+            (c, connection)
+            for c, connection in self.connections.items()
+            if connection.target.s.is_cuda
+        ]
+        if len(cuda) < 2:
+            return {}
+
+        for c, connection in cuda:
+            if c not in self._conn_streams:
+                self._conn_streams[c] = torch.cuda.Stream(
+                    device=connection.target.s.device
+                )
+
+        return self._conn_streams
+
+    @staticmethod
+    def _join_streams(streams: Dict[str, "torch.cuda.Stream"]) -> None:
+        # language=rst
+        """
+        Makes the current stream wait for all work queued on the given streams.
+
+        :param streams: Mapping of layer or connection names to CUDA streams.
+        """
+        for stream in streams.values():
+            torch.cuda.current_stream(stream.device).wait_stream(stream)
 
     def _get_inputs(self, layers: Iterable = None) -> Dict[str, torch.Tensor]:
         # language=rst
@@ -226,28 +574,237 @@ class Network(torch.nn.Module):
         :param layers: Layers to update inputs for. Defaults to all network layers.
         :return: Inputs to all layers for the current iteration.
         """
-        inputs = {}
+        if self._target_plan is None:
+            self._compile_plan()
 
         if layers is None:
-            layers = self.layers
-
-        # Loop over network connections.
-        for c in self.connections:
-            if c[1] in layers:
-                # Fetch source and target populations.
-                source = self.connections[c].source
-                target = self.connections[c].target
-
-                if not c[1] in inputs:
-                    inputs[c[1]] = torch.zeros(
-                        self.batch_size, *target.shape, device=target.s.device
-                    )
+            # All layers: use the straight-line version specialized to the plan.
+            if self._fast_inputs is None or self._fast_inputs[0] != self.batch_size:
+                self._fast_inputs = (self.batch_size, self._codegen_get_inputs())
+
+            return self._fast_inputs[1]()
+
+        # Compute all contributions before writing to the input buffers, since a
+        # layer may still reference last timestep's buffer (e.g., ``Input.s``).
+        names, buffers, contributions = [], [], []
+        for name, target, incoming in self._target_plan:
+            if name in layers:
+                names.append(name)
+                buffers.append(self._input_buffer(name, target))
+                contributions.append(
+                    [compute(source.s) for _, source, compute in incoming]
+                )
+
+        if not names:
+            return {}
+
+        # Write each target buffer once: a copy for a single incoming connection, a
+        # single reduction over all contributions otherwise.
+        for buffer, posts in zip(buffers, contributions):
+            _sum_into(buffer, posts)
+
+        return dict(zip(names, buffers))
+
+    def _codegen_get_inputs(
+        self, externals: Optional[Dict[str, torch.Tensor]] = None
+    ) -> Callable[..., Dict[str, torch.Tensor]]:
+        # language=rst
+        """
+        Generates a function equivalent to ``_get_inputs()`` for the current plan, with
+        every connection, source layer and input buffer bound to a local name so that
+        a call involves no dictionary iteration or membership tests.
+
+        :param externals: Optional external inputs of shape ``[time, batch_size, ...]``
+            to add to the inputs of layers with incoming connections, as part of
+            writing their input buffers.
+        :return: Function taking the timestep (only used to index ``externals``;
+            defaults to 0) and returning inputs to all layers.
+        """
+        if externals is None:
+            externals = {}
+
+        namespace = {"torch": torch, "_sum_into": _sum_into}
+        lines = ["def _get_inputs(t=0):"]
+        buffers, contributions = [], []
+        for i, (name, target, incoming) in enumerate(self._target_plan):
+            namespace[f"b{i}"] = self._input_buffer(name, target)
+            buffers.append((name, f"b{i}"))
+            if name in externals:
+                namespace[f"e{i}"] = externals[name]
+
+            posts = []
+            for j, (_, source, compute) in enumerate(incoming):
+                namespace[f"compute{i}_{j}"] = compute
+                namespace[f"source{i}_{j}"] = source
+                lines.append(f"    p{i}_{j} = compute{i}_{j}(source{i}_{j}.s)")
+                posts.append(f"p{i}_{j}")
+
+            contributions.append(posts)
+
+        # Same two-phase update as ``_get_inputs``: compute everything first, then
+        # write each target buffer once.
+        for i, ((name, b), posts) in enumerate(zip(buffers, contributions)):
+            if len(posts) == 1 and name in externals:
+                lines.append(f"    torch.add({posts[0]}, e{i}[t], out={b})")
+            elif len(posts) == 1:
+                lines.append(f"    {b}.copy_({posts[0]})")
+            else:
+                lines.append(f"    _sum_into({b}, [{', '.join(posts)}])")
+                if name in externals:
+                    lines.append(f"    {b}.add_(e{i}[t])")
+
+        entries = ", ".join(f"{name!r}: {b}" for name, b in buffers)
+        lines.append(f"    return {{{entries}}}")
 
-                # Add to input: source's spikes multiplied by connection weights.
-                inputs[c[1]] += self.connections[c].compute(source.s)
+        code = compile("\n".join(lines), "<bindsnet.Network._get_inputs>", "exec")
+        exec(code, namespace)
 
-        return inputs
+        return namespace["_get_inputs"]
+
+    def _codegen_step(
+        self,
+        layer_steps: list,
+        get_inputs: Callable[[int], Dict[str, torch.Tensor]],
+        masks: Dict[tuple, torch.Tensor],
+        kwargs: dict,
+    ) -> Callable[[int], None]:
+        # language=rst
+        """
+        Generates a function running one synchronous, single-threaded timestep of
+        ``run``: computing inputs, updating and clamping layers, updating connections
+        and recording monitors. Branches that are decided for the whole simulation
+        (external input, clamps, masks) are resolved while generating the code.
+
+        :param layer_steps: Per-layer ``(name, layer, external, zeros, fed,
+            schedule)`` entries returned by ``_layer_steps``.
+        :param get_inputs: Function returned by ``_codegen_get_inputs``.
+        :param masks: Mapping of connection names to weight masks.
+        :param kwargs: Keyword arguments passed to connection updates.
+        :return: Function taking the timestep.
+        """
+        namespace = {
+            "get_inputs": get_inputs,
+            "_apply_clamps": _apply_clamps,
+            "learning": self.learning,
+            "kwargs": kwargs,
+        }
+        lines = ["def _step(t):", "    get_inputs(t)"]
+        for i, (l, layer, external, zeros, fed, schedule) in enumerate(layer_steps):
+            namespace[f"layer{i}"] = layer
+            if fed:
+                namespace[f"x{i}"] = self._input_bufs[l]
+                x = f"x{i}"
+            elif external is not None:
+                namespace[f"external{i}"] = external
+                x = f"external{i}[t]"
+            else:
+                namespace[f"zeros{i}"] = zeros
+                x = f"zeros{i}.zero_()"
+
+            lines.append(f"    layer{i}.forward(x={x})")
+            if schedule is not None:
+                namespace[f"schedule{i}"] = schedule
+                lines.append(
+                    f"    _apply_clamps(layer{i}.s, getattr(layer{i}, 'v', None), "
+                    f"*schedule{i}[t])"
+                )
+
+        for j, (c, connection, _) in enumerate(self._conn_plan):
+            namespace[f"connection{j}"] = connection
+            namespace[f"mask{j}"] = masks.get(c, None)
+            lines.append(
+                f"    connection{j}.update(mask=mask{j}, learning=learning, **kwargs)"
+            )
+
+        for k, monitor in enumerate(self._monitor_plan):
+            namespace[f"monitor{k}"] = monitor
+            lines.append(f"    monitor{k}.record_at(t)")
+
+        code = compile("\n".join(lines), "<bindsnet.Network.run>", "exec")
+        exec(code, namespace)
+
+        return namespace["_step"]
+
+    def _input_buffer(self, name: str, target: Nodes) -> torch.Tensor:
+        # language=rst
+        """
+        Returns the persistent input buffer of a layer, allocating it if needed.
 
+        :param name: Logical name of the layer.
+        :param target: The layer receiving the input.
+        :return: Buffer of shape ``[batch_size, *target.shape]``.
+        """
+        buffer = self._input_bufs.get(name)
+        if buffer is None or buffer.size(0) != self.batch_size:
+            buffer = torch.zeros(self.batch_size, *target.shape, device=target.s.device)
+            self._input_bufs[name] = buffer
+
+        return buffer
+
+    def _zero_input(self, name: str, layer: Nodes) -> torch.Tensor:
+        # language=rst
+        """
+        Returns an all-zero input for a layer that receives no input this timestep,
+        reusing the same tensor on every timestep. Layers may keep or modify their
+        input (e.g., ``Input.s``), so it must be cleared with ``zero_()`` before each
+        use.
+
+        :param name: Logical name of the layer.
+        :param layer: The layer receiving the input.
+        :return: Zero tensor with the shape and device of ``layer.s``.
+        """
+        zeros = self._zero_inputs.get(name)
+        if zeros is None or zeros.shape != layer.s.shape:
+            zeros = torch.zeros(layer.s.shape, device=layer.s.device)
+            self._zero_inputs[name] = zeros
+        else:
+            zeros.zero_()
+
+        return zeros
+
+    def _layer_steps(
+        self,
+        inputs: Dict[str, torch.Tensor],
+        schedules: Dict[str, list],
+        fold_externals: bool = False,
+    ) -> Tuple[list, Dict[str, torch.Tensor]]:
+        # language=rst
+        """
+        Resolves once per simulation what each layer of the plan needs on every
+        timestep: its external input, whether it has incoming connections, its clamps
+        and, for layers with neither incoming connections nor external input, a zero
+        input. External inputs are made contiguous with time as the leading
+        dimension, so that each timestep is a cheap contiguous view; the simulation
+        cannot be vectorized over time, since every step depends on the previous one.
+
+        :param inputs: Mapping of layer names to external inputs of shape
+            ``[time, batch_size, ...]``.
+        :param schedules: Per-layer clamps returned by ``_clamp_schedules``.
+        :param fold_externals: Whether to leave the external inputs of layers with
+            incoming connections out of the steps, to be added while writing their
+            input buffers instead.
+        :return: List of ``(name, layer, external, zeros, fed, schedule)`` entries in
+            layer order, and the mapping of layer names to folded external inputs.
+        """
+        fed_layers = {name for name, _, _ in self._target_plan}
+        externals, layer_steps = {}, []
+        for l, layer in self._layer_plan:
+            external, zeros = inputs.get(l), None
+            if external is not None:
+                external = external.contiguous()
+                if fold_externals and l in fed_layers:
+                    externals[l], external = external, None
+            elif l not in fed_layers:
+                zeros = self._zero_input(l, layer)
+
+            layer_steps.append(
+                (l, layer, external, zeros, l in fed_layers, schedules.get(l, None))
+            )
+
+        return layer_steps, externals
+
+    # Simulation only mutates state in place; no autograd bookkeeping is needed.
+    @torch.no_grad()
     def run(
         self, inputs: Dict[str, torch.Tensor], time: int, one_step=False, **kwargs
     ) -> None:
@@ -348,89 +905,122 @@ class Network(torch.nn.Module):
         # Effective number of timesteps.
         timesteps = int(time / self.dt)
 
+        # Flatten network structure once for the whole simulation. Weights are fixed
+        # while neither learning nor masking, so dense connections can be merged.
+        self._compile_plan(merge_dense=not self.learning and not masks)
+
+        # In synchronous single-threaded mode, the external input of layers with
+        # incoming connections is added while writing their input buffers.
+        schedules = _clamp_schedules(clamps, unclamps, injects_v, timesteps)
+        fold_externals = not one_step and self.n_threads == 0
+        layer_steps, externals = self._layer_steps(inputs, schedules, fold_externals)
+
+        if fold_externals:
+            get_inputs = self._codegen_get_inputs(externals)
+
+        if self.n_threads != 0:
+            threadManager = self._thread_manager(self.n_threads)
+        else:
+            # Connections on the GPU are updated concurrently on their own streams.
+            conn_streams = self._connection_streams()
+
+        # In the common case, run each timestep as one straight-line function.
+        step = None
+        if fold_externals and not conn_streams:
+            step = self._codegen_step(layer_steps, get_inputs, masks, kwargs)
+
+        # Let monitors allocate their recordings for the whole simulation.
+        for monitor in self._monitor_plan:
+            monitor.preallocate(timesteps)
+
         # Simulate network activity for `time` timesteps.
         for t in range(timesteps):
+            if step is not None:
+                step(t)
+                continue
+
             # Get input to all layers (synchronous mode).
             current_inputs = {}
             if not one_step:
                 if self.n_threads == 0:
-                    current_inputs.update(self._get_inputs())
+                    current_inputs.update(get_inputs(t))
                 else:
-                    current_inputs.update(self._get_inputs_threadManager())
-            
-            for l in self.layers:
-                # Update each layer of nodes.
-                if l in inputs:
-                    if l in current_inputs:
-                        current_inputs[l] += inputs[l][t]
-                    else:
-                        current_inputs[l] = inputs[l][t]
-
-                if one_step:
-                    # Get input to this layer (one-step mode).
-                    current_inputs.update(self._get_inputs(layers=[l]))
+                    current_inputs.update(self._get_inputs())
 
-                if l in current_inputs:
-                    if self.n_threads == 0:
-                        self.layers[l].forward(x=current_inputs[l])
-                    else:
-                        self.threadManager.q0.put({"type":"forward","items":(self.layers[l],current_inputs[l])})
+            for l, layer, external, zeros, fed, schedule in layer_steps:
+                # Update each layer of nodes.
+                if not fed:
+                    x = external[t] if external is not None else zeros.zero_()
                 else:
-                    if self.n_threads == 0:
-                        self.layers[l].forward(x=torch.zeros(self.layers[l].s.shape))
-                    else:
-                        self.threadManager.q0.put({"type":"forward","items":(self.layers[l],torch.zeros(self.layers[l].s.shape))})
+                    if external is not None:
+                        if l in current_inputs:
+                            current_inputs[l] += external[t]
+                        else:
+                            current_inputs[l] = external[t]
 
-                if self.n_threads != 0:
-                    self.threadManager.q0.join()
+                    if one_step:
+                        # Get input to this layer (one-step mode).
+                        current_inputs.update(self._get_inputs(layers=[l]))
 
-                # Clamp neurons to spike.
-                clamp = clamps.get(l, None)
-                if clamp is not None:
-                    if clamp.ndimension() == 1:
-                        self.layers[l].s[:, clamp] = 1
-                    else:
-                        self.layers[l].s[:, clamp[t]] = 1
+                    x = current_inputs[l]
 
-                # Clamp neurons not to spike.
-                unclamp = unclamps.get(l, None)
-                if unclamp is not None:
-                    if unclamp.ndimension() == 1:
-                        self.layers[l].s[:, unclamp] = 0
-                    else:
-                        self.layers[l].s[:, unclamp[t]] = 0
+                if self.n_threads == 0:
+                    layer.forward(x=x)
+                else:
+                    threadManager.submit(layer.forward, x)
+                    threadManager.join()
 
-                # Inject voltage to neurons.
-                inject_v = injects_v.get(l, None)
-                if inject_v is not None:
-                    if inject_v.ndimension() == 1:
-                        self.layers[l].v += inject_v
-                    else:
-                        self.layers[l].v += inject_v[t]
+                # Clamp neurons and inject voltage.
+                if schedule is not None:
+                    _apply_clamps(layer.s, getattr(layer, "v", None), *schedule[t])
 
             # Run synapse updates.
-            for c in self.connections:
-                if self.n_threads == 0:
-                    self.connections[c].update(
+            for c, connection, _ in self._conn_plan:
+                if self.n_threads != 0:
+                    threadManager.submit(
+                        connection.update,
+                        mask=masks.get(c, None),
+                        learning=self.learning,
+                        **kwargs
+                    )
+                    continue
+
+                stream = conn_streams.get(c)
+                if stream is None:
+                    connection.update(
                         mask=masks.get(c, None), learning=self.learning, **kwargs
                     )
                 else:
-                    self.threadManager.q0.put({"type":"connectionUpdate","items":(self.connections[c],masks.get(c, None),self.learning)})
+                    # Updates must not start before this timestep's layer updates.
+                    stream.wait_stream(torch.cuda.current_stream(stream.device))
+                    with torch.cuda.stream(stream):
+                        connection.update(
+                            mask=masks.get(c, None), learning=self.learning, **kwargs
+                        )
 
             if self.n_threads != 0:
-                self.threadManager.q0.join()
+                threadManager.join()
+            else:
+                self._join_streams(conn_streams)
 
             # Get input to all layers.
             # OYS 11/28/20 is this necessary? Seems like it gets negated upon the next loop
             #current_inputs.update(self._get_inputs())
 
             # Record state variables of interest.
-            for m in self.monitors:
-                self.monitors[m].record()
+            for monitor in self._monitor_plan:
+                monitor.record_at(t)
 
         # Re-normalize connections.
-        for c in self.connections:
-            self.connections[c].normalize()
+        self._normalize_connections()
+
+    def _normalize_connections(self) -> None:
+        # language=rst
+        """
+        Normalizes all connections with their own ``normalize()``.
+        """
+        for _, connection, _ in self._conn_plan:
+            connection.normalize()
 
     def reset_state_variables(self) -> None:
         # language=rst
@@ -458,11 +1048,6 @@ class Network(torch.nn.Module):
         self.learning = mode
         return super().train(mode)
 
-    def wait_for_next_thread(self,threads,n_threads):
-        while len(threads) > n_threads:
-            threads[0].join()
-            del threads[0]
-
     def runThreaded(
         self, inputs: Dict[str, torch.Tensor], time: int, one_step=False, n_threads=1, **kwargs
     ) -> None:
@@ -564,6 +1149,27 @@ class Network(torch.nn.Module):
         # Effective number of timesteps.
         timesteps = int(time / self.dt)
 
+        # Flatten network structure once for the whole simulation.
+        self._compile_plan()
+
+        # Persistent worker threads shared by every phase of every timestep.
+        threadManager = self._thread_manager(n_threads)
+
+        # Layers on the GPU each get a dedicated stream, so that the kernels of
+        # independent layers can overlap on the device.
+        streams = self._layer_streams()
+        schedules = _clamp_schedules(clamps, unclamps, injects_v, timesteps)
+
+        # Resolve everything each layer needs per timestep once, as in ``run``.
+        layer_steps = [
+            step + (streams.get(step[0], None),)
+            for step in self._layer_steps(inputs, schedules)[0]
+        ]
+
+        conn_steps = [
+            (connection, masks.get(c, None)) for c, connection, _ in self._conn_plan
+        ]
+
         # Simulate network activity for `time` timesteps.
         for t in range(timesteps):
             # Get input to all layers (synchronous mode).
@@ -572,267 +1178,95 @@ class Network(torch.nn.Module):
                 current_inputs.update(self._get_inputs())
 
             # run node layer updates
-            threads = []
-            for l in self.layers:
-                if l in inputs:
-                    if l in current_inputs:
-                        current_inputs[l] += inputs[l][t]
+            for l, layer, external, zeros, fed, schedule, stream in layer_steps:
+                if not fed:
+                    if external is not None:
+                        layer_inputs = external[t]
                     else:
-                        current_inputs[l] = inputs[l][t]
-
-                if one_step:
-                    # Get input to this layer (one-step mode).
-                    current_inputs.update(self._get_inputs(layers=[l]))
-
-                layer_inputs = current_inputs[l] if (l in current_inputs) else torch.zeros(self.layers[l].s.shape)
-                self.wait_for_next_thread(threads,n_threads)
-                t = threading.Thread(target=self._layer_evaluation,args=(l,self.layers[l],layer_inputs,t,injects_v,clamps,unclamps,))
-                t.start()
-                threads.append(t)
-            
-            for t in threads:
-                t.join()
-
-            # Run synapse updates.
-            threads = []
-            for c in self.connections:
-                self.wait_for_next_thread(threads,n_threads)
-                t = threading.Thread(target=self._connection_update,args=(self.connections[c],masks,kwargs,)) 
-                t.start()
-                threads.append(t)
-            
-            for t in threads:
-                t.join()
-
-            # Get input to all layers.
-            # OYS 11/28/20 is this necessary? Seems like it gets negated upon the next loop
-            current_inputs.update(self._get_inputs())
-
-            # Record state variables of interest.
-            threads = []
-            for m in self.monitors:
-                self.wait_for_next_thread(threads,n_threads)
-                t = threading.Thread(target=self._monitor_record,args=(self.monitors[m],)) 
-                t.start()
-                threads.append(t)
-            
-            for t in threads:
-                t.join()
-            
-        # Re-normalize connections.
-        threads = []
-        for c in self.connections:
-            self.wait_for_next_thread(threads,n_threads)
-            t = threading.Thread(target=self._connection_normalize,args=(self.connections[c],))
-            t.start()
-            threads.append(t)
-        
-        for t in threads:
-            t.join()
-            
-
-    def _connection_update(self,c,masks,kwargs):
-        c.update(
-            mask=masks.get(c, None), learning=self.learning, **kwargs
-        )
-        self.response_queue.put(True)
-
-    def _monitor_record(self,m):
-        m.record()
-        self.response_queue.put(True)
-
-    def _connection_normalize(self,c):
-        c.normalize()
-        self.response_queue.put(True)
-
-    def _layer_evaluation(self,l,layer,inputs,t,injects_v,clamps,unclamps):
-        print("Thread workig on layer",l)
-        # Update each layer of nodes.
-        layer.forward(x=inputs)
-
-        # Clamp neurons to spike.
-        clamp = clamps.get(l, None)
-        if clamp is not None:
-            if clamp.ndimension() == 1:
-                layer.s[:, clamp] = 1
-            else:
-                layer.s[:, clamp[t]] = 1
-
-        # Clamp neurons not to spike.
-        unclamp = unclamps.get(l, None)
-        if unclamp is not None:
-            if unclamp.ndimension() == 1:
-                layer.s[:, unclamp] = 0
-            else:
-                layer.s[:, unclamp[t]] = 0
-
-        # Inject voltage to neurons.
-        inject_v = injects_v.get(l, None)
-        if inject_v is not None:
-            if inject_v.ndimension() == 1:
-                layer.v += inject_v
-            else:
-                layer.v += inject_v[t]
-
-        print("Layer done:",l)
-        self.response_queue.put(True)
-
-    def runThreadPool(
-        self, inputs: Dict[str, torch.Tensor], time: int, one_step=False, **kwargs
-    ) -> None:
-        # language=rst
-        """
-        Simulate network for given inputs and time.
-
-        :param inputs: Dictionary of ``Tensor``s of shape ``[time, *input_shape]`` or
-                      ``[time, batch_size, *input_shape]``.
-        :param time: Simulation time.
-        :param one_step: Whether to run the network in "feed-forward" mode, where inputs
-            propagate all the way through the network in a single simulation time step.
-            Layers are updated in the order they are added to the network.
-
-        Keyword arguments:
-
-        :param Dict[str, torch.Tensor] clamp: Mapping of layer names to boolean masks if
-            neurons should be clamped to spiking. The ``Tensor``s have shape
-            ``[n_neurons]`` or ``[time, n_neurons]``.
-        :param Dict[str, torch.Tensor] unclamp: Mapping of layer names to boolean masks
-            if neurons should be clamped to not spiking. The ``Tensor``s should have
-            shape ``[n_neurons]`` or ``[time, n_neurons]``.
-        :param Dict[str, torch.Tensor] injects_v: Mapping of layer names to boolean
-            masks if neurons should be added voltage. The ``Tensor``s should have shape
-            ``[n_neurons]`` or ``[time, n_neurons]``.
-        :param Union[float, torch.Tensor] reward: Scalar value used in reward-modulated
-            learning.
-        :param Dict[Tuple[str], torch.Tensor] masks: Mapping of connection names to
-            boolean masks determining which weights to clamp to zero.
-
-        **Example:**
-
-        .. code-block:: python
+                        layer_inputs = zeros.zero_()
+                else:
+                    if external is not None:
+                        if l in current_inputs:
+                            current_inputs[l] += external[t]
+                        else:
+                            current_inputs[l] = external[t]
 
-            import torch
-            import matplotlib.pyplot as plt
+                    if one_step:
+                        # Layers depend on those before them in one-step mode; wait
+                        # for them before fetching this layer's input.
+                        threadManager.join()
+                        self._join_streams(streams)
 
-            from bindsnet.network import Network
-            from bindsnet.network.nodes import Input
-            from bindsnet.network.monitors import Monitor
+                        # Get input to this layer (one-step mode).
+                        current_inputs.update(self._get_inputs(layers=[l]))
 
-            # Build simple network.
-            network = Network()
-            network.add_layer(Input(500), name='I')
-            network.add_monitor(Monitor(network.layers['I'], state_vars=['s']), 'I')
+                    layer_inputs = current_inputs[l]
 
-            # Generate spikes by running Bernoulli trials on Uniform(0, 0.5) samples.
-            spikes = torch.bernoulli(0.5 * torch.rand(500, 500))
+                step_clamps = schedule[t] if schedule is not None else None
 
-            # Run network simulation.
-            network.run(inputs={'I' : spikes}, time=500)
+                if stream is not None:
+                    # Layer stream must not start before its input is ready.
+                    stream.wait_stream(torch.cuda.current_stream(stream.device))
 
-            # Look at input spiking activity.
-            spikes = network.monitors['I'].get('s')
-            plt.matshow(spikes, cmap='binary')
-            plt.xticks(()); plt.yticks(());
-            plt.xlabel('Time'); plt.ylabel('Neuron index')
-            plt.title('Input spiking')
-            plt.show()
-        """
-        # Parse keyword arguments.
-        clamps = kwargs.get("clamp", {})
-        unclamps = kwargs.get("unclamp", {})
-        masks = kwargs.get("masks", {})
-        injects_v = kwargs.get("injects_v", {})
+                threadManager.submit(
+                    self._layer_evaluation,
+                    l,
+                    layer,
+                    layer_inputs,
+                    step_clamps,
+                    stream,
+                )
 
-        # Compute reward.
-        if self.reward_fn is not None:
-            kwargs["reward"] = self.reward_fn.compute(**kwargs)
+            threadManager.join()
+            self._join_streams(streams)
 
-        # Dynamic setting of batch size.
-        if inputs != {}:
-            for key in inputs:
-                # goal shape is [time, batch, n_0, ...]
-                if len(inputs[key].size()) == 1:
-                    # current shape is [n_0, ...]
-                    # unsqueeze twice to make [1, 1, n_0, ...]
-                    inputs[key] = inputs[key].unsqueeze(0).unsqueeze(0)
-                elif len(inputs[key].size()) == 2:
-                    # current shape is [time, n_0, ...]
-                    # unsqueeze dim 1 so that we have
-                    # [time, 1, n_0, ...]
-                    inputs[key] = inputs[key].unsqueeze(1)
-
-            for key in inputs:
-                # batch dimension is 1, grab this and use for batch size
-                if inputs[key].size(1) != self.batch_size:
-                    self.batch_size = inputs[key].size(1)
-
-                    for l in self.layers:
-                        self.layers[l].set_batch_size(self.batch_size)
-
-                    for m in self.monitors:
-                        self.monitors[m].reset_state_variables()
+            # Run synapse updates.
+            for connection, mask in conn_steps:
+                threadManager.submit(self._connection_update, connection, mask, kwargs)
 
-                break
+            threadManager.join()
 
-        # Effective number of timesteps.
-        timesteps = int(time / self.dt)
+            # Record state variables of interest.
+            for monitor in self._monitor_plan:
+                threadManager.submit(self._monitor_record, monitor)
 
-        # Simulate network activity for `time` timesteps.
-        for t in range(timesteps):
-            # Get input to all layers (synchronous mode).
-            current_inputs = {}
-            if not one_step:
-                current_inputs.update(self._get_inputs())
+            threadManager.join()
 
-            # run node layer updates
-            for l in self.layers:
-                if l in inputs:
-                    if l in current_inputs:
-                        current_inputs[l] += inputs[l][t]
-                    else:
-                        current_inputs[l] = inputs[l][t]
+        # Re-normalize connections.
+        for _, connection, _ in self._conn_plan:
+            threadManager.submit(self._connection_normalize, connection)
 
-                if one_step:
-                    # Get input to this layer (one-step mode).
-                    current_inputs.update(self._get_inputs(layers=[l]))
+        threadManager.join()
 
-                layer_inputs = current_inputs[l] if (l in current_inputs) else torch.zeros(self.layers[l].s.shape)
-                self.threadPool.apply_async(self._layer_evaluation,args=(l,self.layers[l],layer_inputs,t,injects_v,clamps,unclamps,))
-            
-            for l in self.layers:
-                self.response_queue.get()
-                self.response_queue.task_done()
+    def _connection_update(self, c, mask, kwargs):
+        c.update(mask=mask, learning=self.learning, **kwargs)
 
-            # Run synapse updates.
-            for c in self.connections:
-                self.threadPool.apply_async(self._connection_update,args=(self.connections[c],masks,kwargs,))
-            
-            for c in self.connections:
-                self.response_queue.get()
-                self.response_queue.task_done()
+    def _monitor_record(self, m):
+        m.record()
 
-            # Get input to all layers.
-            # OYS 11/28/20 is this necessary? Seems like it gets negated upon the next loop
-            # current_inputs.update(self._get_inputs())
+    def _connection_normalize(self, c):
+        c.normalize()
 
-            # Record state variables of interest.
-            for m in self.monitors:
-                self.threadPool.apply_async(self._monitor_record,args=(self.monitors[m],))
-            
-            for m in self.monitors:
-                self.response_queue.get()
-                self.response_queue.task_done()
+    def _layer_evaluation(self, l, layer, inputs, step_clamps, stream=None):
+        # Enqueue this layer's kernels on its own CUDA stream, if it has one.
+        context = torch.cuda.stream(stream) if stream is not None else nullcontext()
+        with context:
+            # Update each layer of nodes.
+            layer.forward(x=inputs)
 
-        # Re-normalize connections.
-        for c in self.connections:
-            self.connections[c].normalize()
+            # Clamp neurons and inject voltage.
+            if step_clamps is not None:
+                _apply_clamps(layer.s, getattr(layer, "v", None), *step_clamps)
 
     def runThreadManager(
         self, inputs: Dict[str, torch.Tensor], time: int, one_step=False, **kwargs
     ) -> None:
         # language=rst
         """
-        Simulate network for given inputs and time.
+        Simulate network for given inputs and time. Kept for compatibility: layers and
+        connections are updated inline on the calling thread, as in ``run`` with
+        ``n_threads=0``, since PyTorch kernels already release the GIL and handing
+        each small update to a worker thread costs more than it saves.
 
         :param inputs: Dictionary of ``Tensor``s of shape ``[time, *input_shape]`` or
                       ``[time, batch_size, *input_shape]``.
@@ -887,239 +1321,187 @@ class Network(torch.nn.Module):
             plt.title('Input spiking')
             plt.show()
         """
-        # Parse keyword arguments.
-        clamps = kwargs.get("clamp", {})
-        unclamps = kwargs.get("unclamp", {})
-        masks = kwargs.get("masks", {})
-        injects_v = kwargs.get("injects_v", {})
+        n_threads, self.n_threads = self.n_threads, 0
+        try:
+            self.run(inputs=inputs, time=time, one_step=one_step, **kwargs)
+        finally:
+            self.n_threads = n_threads
 
-        # Compute reward.
-        if self.reward_fn is not None:
-            kwargs["reward"] = self.reward_fn.compute(**kwargs)
 
-        # Dynamic setting of batch size.
-        if inputs != {}:
-            for key in inputs:
-                # goal shape is [time, batch, n_0, ...]
-                if len(inputs[key].size()) == 1:
-                    # current shape is [n_0, ...]
-                    # unsqueeze twice to make [1, 1, n_0, ...]
-                    inputs[key] = inputs[key].unsqueeze(0).unsqueeze(0)
-                elif len(inputs[key].size()) == 2:
-                    # current shape is [time, n_0, ...]
-                    # unsqueeze dim 1 so that we have
-                    # [time, 1, n_0, ...]
-                    inputs[key] = inputs[key].unsqueeze(1)
-
-            for key in inputs:
-                # batch dimension is 1, grab this and use for batch size
-                if inputs[key].size(1) != self.batch_size:
-                    self.batch_size = inputs[key].size(1)
-
-                    for l in self.layers:
-                        self.layers[l].set_batch_size(self.batch_size)
-
-                    for m in self.monitors:
-                        self.monitors[m].reset_state_variables()
-
-                break
-
-        # Effective number of timesteps.
-        timesteps = int(time / self.dt)
-
-        # Simulate network activity for `time` timesteps.
-        for t in range(timesteps):
-            # Get input to all layers (synchronous mode).
-            current_inputs = {}
-            if not one_step:
-                current_inputs.update(self._get_inputs_threadManager())
-            
-            for l in self.layers:
-                # Update each layer of nodes.
-                if l in inputs:
-                    if l in current_inputs:
-                        current_inputs[l] += inputs[l][t]
-                    else:
-                        current_inputs[l] = inputs[l][t]
+class _DenseGroup:
+    # language=rst
+    """
+    Several dense connections into the same target layer, computed as one matrix
+    multiplication of their concatenated source spikes with their concatenated
+    weights. The weights are copied when the group is created, so it must be rebuilt
+    whenever they change (``run`` rebuilds it on every call).
+    """
 
-                if one_step:
-                    # Get input to this layer (one-step mode).
-                    current_inputs.update(self._get_inputs(layers=[l]))
+    def __init__(self, connections: List[Connection]) -> None:
+        # language=rst
+        """
+        Concatenates the weights and sums the biases of the given connections.
 
-                if l in current_inputs:
-                    self.threadManager.q0.put({"type":"forward","items":(self.layers[l],current_inputs[l])})
-                else:
-                    self.threadManager.q0.put({"type":"forward","items":(self.layers[l],torch.zeros(self.layers[l].s.shape))})
+        :param connections: Dense connections sharing the same target layer.
+        """
+        self.sources = [c.source for c in connections]
+        self.w = torch.cat([c.w for c in connections], 0)
+        self.b = torch.stack([c.b for c in connections]).sum(0)
+        self.target_shape = connections[0].target.shape
+
+        # Column range of each source in the concatenated spikes.
+        self.slices = []
+        start = 0
+        for source in self.sources:
+            self.slices.append(slice(start, start + source.n))
+            start += source.n
+
+        self.spikes = None
+
+    @property
+    def s(self) -> torch.Tensor:
+        # language=rst
+        """
+        Spikes of all source layers, concatenated along the neuron dimension.
+        """
+        batch_size = self.sources[0].s.size(0)
+        if self.spikes is None or self.spikes.size(0) != batch_size:
+            self.spikes = torch.empty(
+                batch_size, self.w.size(0), dtype=self.w.dtype, device=self.w.device
+            )
 
-            self.threadManager.q0.join()
+        for source, columns in zip(self.sources, self.slices):
+            self.spikes[:, columns].copy_(source.s.view(batch_size, -1))
 
-            for l in self.layers:
-                # Clamp neurons to spike.
-                clamp = clamps.get(l, None)
-                if clamp is not None:
-                    if clamp.ndimension() == 1:
-                        self.layers[l].s[:, clamp] = 1
-                    else:
-                        self.layers[l].s[:, clamp[t]] = 1
+        return self.spikes
 
-                # Clamp neurons not to spike.
-                unclamp = unclamps.get(l, None)
-                if unclamp is not None:
-                    if unclamp.ndimension() == 1:
-                        self.layers[l].s[:, unclamp] = 0
-                    else:
-                        self.layers[l].s[:, unclamp[t]] = 0
+    def compute(self, s: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Compute pre-activations of the target layer given the concatenated spikes.
 
-                # Inject voltage to neurons.
-                inject_v = injects_v.get(l, None)
-                if inject_v is not None:
-                    if inject_v.ndimension() == 1:
-                        self.layers[l].v += inject_v
-                    else:
-                        self.layers[l].v += inject_v[t]
+        :param s: Concatenated incoming spikes.
+        :return: Sum of the outputs of all connections in the group.
+        """
+        post = torch.addmm(self.b, s, self.w)
 
-            # Run synapse updates.
-            for c in self.connections:
-                self.threadManager.q0.put({"type":"connectionUpdate","items":(self.connections[c],masks.get(c, None),self.learning)})
-            
-            self.threadManager.q0.join()
+        return post.view(s.size(0), *self.target_shape)
 
-            # Record state variables of interest.
-            for m in self.monitors:
-                self.monitors[m].record()
 
-        # Re-normalize connections.
-        for c in self.connections:
-            self.connections[c].normalize()
+# Custom class to assign tasks to threads
+class ThreadManager:
+    # language=rst
+    """
+    Persistent pool of worker threads. Each worker owns a single-producer,
+    single-consumer job queue which the main thread fills round-robin, so no threads
+    are created or joined while a simulation is running. PyTorch's own intra-op
+    thread count is left as configured (see ``torch.set_num_threads``).
+    """
 
-    def _get_inputs_threadPool(self, layers: Iterable = None) -> Dict[str, torch.Tensor]:
+    def __init__(self, n_threads: int) -> None:
         # language=rst
         """
-        Fetches outputs from network layers to use as input to downstream layers.
+        Starts the worker threads.
 
-        :param layers: Layers to update inputs for. Defaults to all network layers.
-        :return: Inputs to all layers for the current iteration.
+        :param n_threads: Number of worker threads.
         """
-        inputs = {}
+        # number of threads to be used
+        self.n_threads = n_threads
 
-        if layers is None:
-            layers = self.layers
-
-        # Loop over network connections.
-        for c in self.connections:
-            if c[1] in layers:
-                # Fetch source and target populations.
-                source = self.connections[c].source
-                target = self.connections[c].target
-
-                if not c[1] in inputs:
-                    inputs[c[1]] = torch.zeros(
-                        self.batch_size, *target.shape, device=target.s.device
-                    )
+        # one job queue per worker
+        self.queues = [queue.SimpleQueue() for _ in range(n_threads)]
 
-                # Add to input: source's spikes multiplied by connection weights.
-                self.threadPool.apply_async(self.connections[c].compute,args=(source.s,None,self.response_queue,))
+        # unfinished tasks, shared with the workers
+        self.tasks = _TaskCounter()
 
-        for c in self.connections:
-            if c[1] in layers:
-                self.response_queue.get()
+        # index of the worker receiving the next task
+        self._next = 0
 
-        return inputs
+        # keep track of threads in a list
+        self.threads = []
+        for q in self.queues:
+            # create and start the threads
+            t = threading.Thread(
+                target=_threadCompute, args=(q, self.tasks), daemon=True
+            )
+            t.start()
+            self.threads.append(t)
+
+        # stop the workers once the manager is garbage collected
+        weakref.finalize(self, _stopThreads, self.queues)
 
-    def _get_inputs_threadManager(self, layers: Iterable = None) -> Dict[str, torch.Tensor]:
+    def submit(self, fn: Callable, *args, **kwargs) -> None:
         # language=rst
         """
-        Fetches outputs from network layers to use as input to downstream layers.
+        Schedules ``fn(*args, **kwargs)`` on the next worker thread.
 
-        :param layers: Layers to update inputs for. Defaults to all network layers.
-        :return: Inputs to all layers for the current iteration.
+        :param fn: Task to run.
         """
-        inputs = {}
-
-        if layers is None:
-            layers = self.layers
-
-        # Loop over network connections.
-        for c in self.connections:
-            if c[1] in layers:
-                # Fetch source and target populations.
-                source = self.connections[c].source
-                target = self.connections[c].target
-
-                if not c[1] in inputs:
-                    inputs[c[1]] = torch.zeros(
-                        self.batch_size, *target.shape, device=target.s.device
-                    )
-
-
-                # Add to input: source's spikes multiplied by connection weights.
-                inputs[c[1]] += self.connections[c].compute(source.s,self.threadManager)
-
-        return inputs
+        self.tasks.add()
+        self.queues[self._next].put((fn, args, kwargs))
+        self._next = (self._next + 1) % self.n_threads
 
+    def join(self) -> None:
+        # language=rst
+        """
+        Blocks until all submitted tasks have finished. Re-raises the first exception
+        raised by a task, if any.
+        """
+        self.tasks.idle.wait()
 
+        error, self.tasks.error = self.tasks.error, None
+        if error is not None:
+            raise error
 
-# Custom class to assign tasks to threads
-class ThreadManager:
-    def __init__(self,n_threads):
 
-        # number of threads to be used
-        self.n_threads = n_threads
-
-        # the job queue
-        self.q0 = queue.Queue()
+class _TaskCounter:
+    # language=rst
+    """
+    Count of unfinished ``ThreadManager`` tasks, with an event set whenever it drops
+    to zero. Kept apart from the manager so that workers don't keep it alive.
+    """
 
-        # the response queue
-        self.q1 = queue.Queue()
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.pending = 0
+
+        # first exception raised by a task since the last ``join``
+        self.error = None
+
+    def add(self) -> None:
+        with self.lock:
+            self.pending += 1
+            self.idle.clear()
+
+    def finish(self, error: Optional[BaseException]) -> None:
+        with self.lock:
+            if self.error is None:
+                self.error = error
+
+            self.pending -= 1
+            if self.pending == 0:
+                self.idle.set()
+
+
+# Thread Manager threads worker logic
+def _threadCompute(jobs: queue.SimpleQueue, tasks: _TaskCounter) -> None:
+    while True:
+        # get a task from the job queue; ``None`` asks the worker to exit
+        task = jobs.get()
+        if task is None:
+            return
+
+        fn, args, kwargs = task
+        try:
+            fn(*args, **kwargs)
+        except BaseException as e:
+            tasks.finish(e)
+        else:
+            tasks.finish(None)
 
-        # keep track of threads in a list
-        self.threads = []
-        for _ in range(n_threads):
-            # create and start the threads
-            t = threading.Thread(target=self._threadCompute,daemon=True)
-            t.start()
-            self.threads.append(t)
 
-    # Thread Manager threads worker logic
-    def _threadCompute(self):
-        while True:
-            # get a task from the job queue
-            task = self.q0.get()
-
-            # get the task type and data
-            taskType = task["type"]
-            items = task["items"]
-
-            # thread should compute the synapse outputs
-            if taskType == "computeInputs":
-                # collect the data and perform matrix multiplication on the partial tensor
-                start_idx = int(items[0][0])
-                end_idx = int(items[0][1])
-                s = items[1]
-                w = items[2]
-                b = items[3]
-                t_spikes  = s
-                t_weights = w[:,start_idx:end_idx]
-                result = t_spikes @ t_weights + b[start_idx:end_idx]
-                returnVal = ((start_idx,end_idx),result)
-
-                # store the results in the response queue for the Connection object to reuse
-                self.q1.put(returnVal)
-                self.q0.task_done()
-
-            # thread should compute the layer output
-            elif taskType == "forward":
-                # collect data and call the layer object's forward method
-                layer = items[0]
-                inputs = items[1]
-                layer.forward(inputs)
-                self.q0.task_done()
-
-            # thread should update the synapse weights
-            elif taskType == "connectionUpdate":
-                # collect data and call the connection object's update method
-                c = items[0]
-                mask = items[1]
-                learning = items[2]
-                c.update( mask=mask, learning=learning)
-                self.q0.task_done()
\ No newline at end of file
+def _stopThreads(queues) -> None:
+    for q in queues:
+        q.put(None)
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from functools import reduce
 from operator import mul
-from typing import Iterable, Optional, Union
+from typing import Iterable, Optional, Tuple, Union
 
 import torch
 
@@ -62,7 +62,7 @@ class Nodes(torch.nn.Module):
         self.traces_additive = (
             traces_additive  # Whether to record spike traces additively.
         )
-        self.register_buffer("s", torch.ByteTensor())  # Spike occurrences.
+        self.register_buffer("s", torch.BoolTensor())  # Spike occurrences.
 
         self.sum_input = sum_input  # Whether to sum all inputs.
 
@@ -140,7 +140,9 @@ class Nodes(torch.nn.Module):
         :param batch_size: Mini-batch size.
         """
         self.batch_size = batch_size
-        self.s = torch.zeros(batch_size, *self.shape, device=self.s.device)
+        self.s = torch.zeros(
+            batch_size, *self.shape, dtype=torch.bool, device=self.s.device
+        )
 
         if self.traces:
             self.x = torch.zeros(batch_size, *self.shape, device=self.x.device)
@@ -415,6 +417,47 @@ class IFNodes(Nodes):
         self.refrac_count = torch.zeros_like(self.v, device=self.refrac_count.device)
 
 
+@torch.jit.script
+def _lif_step(
+    v: torch.Tensor,
+    x: torch.Tensor,
+    refrac_count: torch.Tensor,
+    decay: torch.Tensor,
+    rest: torch.Tensor,
+    thresh: torch.Tensor,
+    reset: torch.Tensor,
+    refrac: torch.Tensor,
+    dt: float,
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    # language=rst
+    """
+    State update of ``LIFNodes`` for a single simulation step, as one TorchScript
+    call, which saves the Python overhead of the individual operations.
+    ``refrac_count`` is updated in place.
+
+    :return: New voltages, spikes and (masked) inputs.
+    """
+    # Decay voltages.
+    v = decay * (v - rest) + rest
+
+    # Integrate inputs.
+    x = x.masked_fill(refrac_count > 0, 0.0)
+
+    # Decrement refractory counters.
+    refrac_count.sub_(dt)
+
+    v.add_(x)  # interlaced
+
+    # Check for spiking neurons.
+    s = v >= thresh
+
+    # Refractoriness and voltage reset.
+    refrac_count.masked_fill_(s, refrac)
+    v.masked_fill_(s, reset)
+
+    return v, s, x
+
+
 class LIFNodes(Nodes):
     # language=rst
     """
@@ -504,23 +547,17 @@ class LIFNodes(Nodes):
 
         :param x: Inputs to the layer.
         """
-        # Decay voltages.
-        self.v = self.decay * (self.v - self.rest) + self.rest
-
-        # Integrate inputs.
-        x.masked_fill_(self.refrac_count > 0, 0.0)
-
-        # Decrement refractory counters.
-        self.refrac_count -= self.dt
-
-        self.v += x  # interlaced
-
-        # Check for spiking neurons.
-        self.s = self.v >= self.thresh
-
-        # Refractoriness and voltage reset.
-        self.refrac_count.masked_fill_(self.s, self.refrac)
-        self.v.masked_fill_(self.s, self.reset)
+        self.v, self.s, x = _lif_step(
+            self.v,
+            x,
+            self.refrac_count,
+            self.decay,
+            self.rest,
+            self.thresh,
+            self.reset,
+            self.refrac,
+            float(self.dt),
+        )
 
         # Voltage clipping to lower bound.
         if self.lbound is not None:
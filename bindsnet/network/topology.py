@@ -9,9 +9,6 @@ from torch.nn.modules.utils import _pair
 
 from .nodes import Nodes
 
-import threading
-import queue
-import time
 
 class AbstractConnection(ABC, Module):
     # language=rst
@@ -123,6 +120,12 @@ class Connection(AbstractConnection):
     Specifies synapses between one or two populations of neurons.
     """
 
+    # Largest fraction of spiking source neurons for which ``compute`` sums the weight
+    # rows of the spiking neurons instead of multiplying by the full weight matrix.
+    # Ignored by ``compute_sparse`` (used by ``Network(sparse_spikes=True)``), which
+    # always sums the rows; set to 0 to always multiply.
+    sparse_threshold = 0.1
+
     def __init__(
         self,
         source: Nodes,
@@ -168,80 +171,74 @@ class Connection(AbstractConnection):
         self.w = Parameter(w, requires_grad=False)
         self.b = Parameter(kwargs.get("b", torch.zeros(target.n)), requires_grad=False)
 
-    # Osaze Shears: Added threadManager and response_queue for ECE 5510 project
-    def compute(self, s: torch.Tensor, threadManager = None, response_queue = None) -> torch.Tensor:
+    def compute(self, s: torch.Tensor) -> torch.Tensor:
         # language=rst
         """
         Compute pre-activations given spikes using connection weights.
 
+        For binary spikes on the CPU, if fewer than a ``sparse_threshold`` fraction
+        of them are set, the weight rows of the spiking neurons are summed (as in
+        :code:`compute_sparse`); otherwise, and for all other inputs, the spikes are
+        multiplied by the full weight matrix. The two sum in a different order, so
+        results may differ in the last bits depending on the firing rate: from
+        timestep to timestep, and from the merged matrix multiplication that
+        ``Network.run`` uses for several dense connections into the same layer
+        while not learning.
+
         :param s: Incoming spikes.
         :return: Incoming spikes multiplied by synaptic weights (with or without
                  decaying spike activation).
         """
+        # binary spikes on the CPU: if few neurons fired, gathering their weight
+        # rows is cheaper than a dense matmul (on GPU, counting the spikes would
+        # force a synchronization)
+        post = None
+        if s.dtype in (torch.bool, torch.uint8) and not s.is_cuda:
+            # count first, so that busy layers don't pay for the spike indices
+            if int(s.count_nonzero()) < self.sparse_threshold * s.numel():
+                batch_idx, neuron_idx = s.view(s.size(0), -1).nonzero(as_tuple=True)
+                post = self._gather_rows(s.size(0), batch_idx, neuron_idx)
 
-        # if threadManager is not specified, perform the standard synapse computation
-        if(threadManager is None):
-            
-            post = s.float().view(s.size(0), -1) @ self.w + self.b
-            
-            # if a response queue was specificed, indicate that this operation was completed
-            if response_queue is not None:
-                response_queue.put(True)
-
-            return post.view(s.size(0), *self.target.shape)
-
-        else:
-
-            # number of threads to kick off
-            n_neurons = self.w.shape[1]
-            cols_per_thread = int(n_neurons / threadManager.n_threads)
-
-            # reshape the batch of spike data
-            spikes = s.float().view(s.size(0), -1)
-
-            # create the new output tensor, use cuda if available
-            post = None
-            if s.is_cuda:
-                post = torch.zeros((s.shape[0],self.w.shape[1]),device=torch.device("cuda"))
-            else:
-                post = torch.zeros((s.shape[0],self.w.shape[1]))
-
-            # add a new task to the job queue for the number of specified threads
-            for i in range(threadManager.n_threads):
-
-                # determine the start and end indexes of each thread's matrix section
-                start_idx = i*cols_per_thread
-                end_idx = (i+1)*cols_per_thread if i != threadManager.n_threads - 1 else n_neurons
-                
-                # create the item to be added to the queue
-                items = ((start_idx,end_idx),spikes,self.w,self.b,cols_per_thread)
-                
-                # add the item to the threadManager's job queue
-                threadManager.q0.put({"type":"computeInputs","items":items})
-
-            # for the number of threads that were initialized
-            for i in range(threadManager.n_threads):
+        if post is None:
+            post = s.to(self.w.dtype).view(s.size(0), -1) @ self.w + self.b
 
-                # get the responses from the threadManager's response queue (q1)
-                items = threadManager.q1.get()
+        return post.view(s.size(0), *self.target.shape)
 
-                # retrieve the start index
-                start_idx = items[0][0]
+    def compute_sparse(self, s: torch.Tensor) -> torch.Tensor:
+        # language=rst
+        """
+        Compute pre-activations given binary spikes by summing the weight rows of the
+        neurons that spiked, instead of multiplying by the full weight matrix. The cost
+        scales with the number of spikes, so this is faster than :code:`compute` when
+        few source neurons fire. Non-binary inputs fall back to :code:`compute`.
 
-                # retrieve the end index
-                end_idx = items[0][1]
+        :param s: Incoming spikes.
+        :return: Incoming spikes multiplied by synaptic weights.
+        """
+        if s.dtype not in (torch.bool, torch.uint8):
+            return self.compute(s)
 
-                # retrieve the tensor result
-                result = items[1]
+        batch_idx, neuron_idx = s.view(s.size(0), -1).nonzero(as_tuple=True)
+        post = self._gather_rows(s.size(0), batch_idx, neuron_idx)
 
-                # update the output tensor at the specified indexes with result
-                post[:,start_idx:end_idx] = result
+        return post.view(s.size(0), *self.target.shape)
 
-                # indicate that the task has been completed
-                threadManager.q1.task_done()
+    def _gather_rows(
+        self, batch_size: int, batch_idx: torch.Tensor, neuron_idx: torch.Tensor
+    ) -> torch.Tensor:
+        # language=rst
+        """
+        Sums the weight rows of the source neurons that spiked, plus the biases.
 
+        :param batch_size: Mini-batch size.
+        :param batch_idx: Batch index of each spike.
+        :param neuron_idx: Source neuron index of each spike.
+        :return: Pre-activations of shape ``[batch_size, target.n]``.
+        """
+        post = self.b.expand(batch_size, -1).clone()
+        post.index_add_(0, batch_idx, self.w.index_select(0, neuron_idx))
 
-            return post
+        return post
 
     def update(self, **kwargs) -> None:
         # language=rst
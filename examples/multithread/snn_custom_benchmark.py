@@ -86,7 +86,7 @@ def main(device,n_threads,n_layers,n_neurons_per,recurrent,batch_size,encoding):
             inputs = {k: v.cuda() for k, v in inputs.items()}
 
         if n_threads > 0:
-            network.runThreadPool(inputs=inputs,time=time,input_time_dim=1)
+            network.runThreaded(inputs=inputs,time=time,n_threads=n_threads,input_time_dim=1)
         else:
             network.run(inputs=inputs,time=time,input_time_dim=1)
 
@@ -54,8 +54,26 @@ class TestConnection:
                 print(d, d == torch.device("cuda:0"))
                 assert d == torch.device("cuda:0")
 
+    def test_compute_sparse(self):
+        l_a = LIFNodes(shape=[2, 5, 5])
+        l_b = LIFNodes(shape=[3, 4])
+        connection = Connection(l_a, l_b, b=torch.rand(l_b.n))
+
+        s = torch.bernoulli(0.1 * torch.ones(4, *l_a.shape)).byte()
+
+        dense = connection.compute(s.float())
+        sparse = connection.compute_sparse(s)
+
+        assert sparse.shape == dense.shape == torch.Size([4, *l_b.shape])
+        assert torch.allclose(sparse, dense, atol=1e-6)
+
+        # Binary spikes below the sparsity threshold take the same path by default.
+        connection.sparse_threshold = 1.0
+        assert torch.allclose(connection.compute(s), dense, atol=1e-6)
+
 
 if __name__ == "__main__":
     tester = TestConnection()
 
     tester.test_transfer()
+    tester.test_compute_sparse()
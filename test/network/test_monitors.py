@@ -31,6 +31,16 @@ class TestMonitor:
     assert _if_mon.get("s").size() == torch.Size([100, 1, _if.n])
     assert _if_mon.get("v").size() == torch.Size([100, 1, _if.n])
 
+    # A simulation that stops early only records the timesteps that ran.
+    partial_mon = Monitor(inpt, state_vars=["s"])
+    partial_mon.preallocate(10)
+    for t in range(3):
+        partial_mon.record_at(t)
+
+    assert partial_mon.get("s").size() == torch.Size([3, 1, inpt.n])
+    partial_mon.preallocate(10)
+    assert partial_mon.get("s").size() == torch.Size([3, 1, inpt.n])
+
     del network.monitors["X"], network.monitors["Y"]
 
     inpt_mon = Monitor(inpt, state_vars=["s"], time=500)
@@ -44,6 +54,13 @@ class TestMonitor:
     assert _if_mon.get("s").size() == torch.Size([500, 1, _if.n])
     assert _if_mon.get("v").size() == torch.Size([500, 1, _if.n])
 
+    spikes = torch.bernoulli(torch.rand(100, inpt.n))
+    network.run(inputs={"X": spikes}, time=100)
+
+    # Bounded recordings keep only the most recent ``time`` timesteps.
+    assert inpt_mon.get("s").size() == torch.Size([500, 1, inpt.n])
+    assert torch.equal(inpt_mon.get("s")[-100:, 0], spikes)
+
 
 class TestNetworkMonitor:
     """
@@ -1,9 +1,12 @@
 import os
 
+import torch
+
 from bindsnet.network.monitors import Monitor
-from bindsnet.network.topology import Connection
+from bindsnet.network.topology import Connection, MeanFieldConnection
 from bindsnet.network.nodes import Input, LIFNodes
 from bindsnet.network import Network, load
+from bindsnet.network.network import _DenseGroup
 
 
 class TestNetwork:
@@ -67,3 +70,109 @@ class TestNetwork:
         del _network
 
         os.remove("net.pt")
+
+    def test_run_threaded_matches_run(self):
+        network = Network(dt=1.0, learning=False)
+        network.add_layer(Input(20), name="X")
+        network.add_layer(LIFNodes(10), name="Y")
+        network.add_layer(LIFNodes(5), name="Z")
+        network.add_connection(
+            Connection(network.layers["X"], network.layers["Y"], wmin=0, wmax=1),
+            source="X",
+            target="Y",
+        )
+        network.add_connection(
+            Connection(network.layers["Y"], network.layers["Z"], wmin=0, wmax=1),
+            source="Y",
+            target="Z",
+        )
+        for l in ["Y", "Z"]:
+            network.add_monitor(
+                Monitor(network.layers[l], state_vars=["s", "v"]), name=l
+            )
+
+        threaded = network.clone()
+        spikes = torch.bernoulli(0.5 * torch.ones(50, 20))
+
+        network.run(inputs={"X": spikes.clone()}, time=50)
+        threaded.runThreaded(inputs={"X": spikes.clone()}, time=50, n_threads=2)
+
+        for l in ["Y", "Z"]:
+            for v in ["s", "v"]:
+                assert torch.equal(
+                    network.monitors[l].get(v), threaded.monitors[l].get(v)
+                )
+
+    def test_clamp_unclamp(self):
+        network = Network(dt=1.0)
+        network.add_layer(Input(4), name="X")
+        network.add_monitor(Monitor(network.layers["X"], state_vars=["s"]), name="X")
+
+        clamp = torch.rand(10, 4) < 0.5
+        unclamp = torch.tensor([False, False, True, True])
+        network.run(inputs={}, time=10, clamp={"X": clamp}, unclamp={"X": unclamp})
+
+        spikes = network.monitors["X"].get("s").view(10, 4).bool()
+        assert torch.equal(spikes, clamp & ~unclamp)
+
+    def test_broadcast_inputs(self):
+        network = Network(dt=1.0)
+        network.add_layer(Input(5), name="X1")
+        network.add_layer(Input(5), name="X2")
+        network.add_layer(LIFNodes(3), name="Y")
+
+        dense = Connection(network.layers["X1"], network.layers["Y"])
+        mean_field = MeanFieldConnection(network.layers["X2"], network.layers["Y"])
+        network.add_connection(dense, source="X1", target="Y")
+        network.add_connection(mean_field, source="X2", target="Y")
+
+        spikes = torch.bernoulli(0.5 * torch.ones(10, 5))
+        network.run(inputs={"X1": spikes, "X2": spikes.flip(0)}, time=10)
+
+        expected = dense.compute(network.layers["X1"].s) + mean_field.compute(
+            network.layers["X2"].s
+        )
+        assert torch.allclose(network._get_inputs()["Y"], expected)
+        assert torch.allclose(network._get_inputs(layers=["Y"])["Y"], expected)
+
+    def test_normalize_connections_matches_normalize(self):
+        network = Network(dt=1.0)
+        for l, n in [("X", 20), ("Y", 10), ("Z", 5)]:
+            network.add_layer(LIFNodes(n), name=l)
+
+        for source, target, norm in [("X", "Y", 3.3), ("Y", "Z", 0.7), ("X", "Z", 1.0)]:
+            w = torch.rand(network.layers[source].n, network.layers[target].n)
+            w[:, :2] = 0
+            network.add_connection(
+                Connection(
+                    network.layers[source], network.layers[target], w=w, norm=norm
+                ),
+                source=source,
+                target=target,
+            )
+
+        expected = {}
+        for c, connection in network.connections.items():
+            copy = connection.w.clone()
+            connection.normalize()
+            expected[c] = connection.w.clone()
+            connection.w.copy_(copy)
+
+        network._compile_plan()
+        network._normalize_connections()
+
+        for c, connection in network.connections.items():
+            assert torch.equal(connection.w, expected[c])
+
+    def test_dense_group_matches_connections(self):
+        sources = [Input(shape=[2, 3]), Input(shape=[4])]
+        target = LIFNodes(shape=[5])
+        connections = [Connection(x, target, b=torch.rand(5)) for x in sources]
+
+        for x in sources:
+            x.s = torch.rand(3, *x.shape) < 0.5
+
+        group = _DenseGroup(connections)
+        expected = sum(c.compute(c.source.s) for c in connections)
+
+        assert torch.allclose(group.compute(group.s), expected)
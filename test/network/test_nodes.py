@@ -95,9 +95,33 @@ class TestNodes:
                 print(d, d == torch.device("cuda:0"))
                 assert d == torch.device("cuda:0")
 
+    def test_lif_forward(self):
+        network = Network(dt=1.0)
+        layer = LIFNodes(10, refrac=3, lbound=-70.0)
+        network.add_layer(layer=layer, name="X")
+
+        # Previous, in-place formulation of ``LIFNodes.forward``.
+        v, refrac_count = layer.v.clone(), layer.refrac_count.clone()
+        for x in 10 * torch.randn(30, 1, 10):
+            v = layer.decay * (v - layer.rest) + layer.rest
+            masked = x.masked_fill(refrac_count > 0, 0.0)
+            refrac_count -= layer.dt
+            v += masked
+            s = v >= layer.thresh
+            refrac_count.masked_fill_(s, layer.refrac)
+            v.masked_fill_(s, layer.reset)
+            v.masked_fill_(v < layer.lbound, layer.lbound)
+
+            layer.forward(x.clone())
+
+            assert torch.equal(layer.s, s)
+            assert torch.equal(layer.v, v)
+            assert torch.equal(layer.refrac_count, refrac_count)
+
 
 if __name__ == "__main__":
     tester = TestNodes()
 
     tester.test_init()
     tester.test_transfer()
+    tester.test_lif_forward()